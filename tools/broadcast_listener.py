@@ -1,12 +1,589 @@
+import argparse
+import asyncio
 import socket
 import json
 import time
+import ctypes
+import errno
+import functools
+import os
+import queue
+import signal
+import sys
+import threading
+
+try:
+    import orjson
+    loads = orjson.loads
+
+    # partial é C puro: nenhum frame Python extra por pacote
+    dumps_pretty = functools.partial(orjson.dumps, option=orjson.OPT_INDENT_2)
+    dumps_compact = orjson.dumps
+except ImportError:  # orjson é opcional: pip install orjson
+    orjson = None
+
+    def loads(data):
+        return json.loads(bytes(data))  # json não aceita memoryview
+
+    def dumps_pretty(msg):
+        return json.dumps(msg, indent=2).encode('utf-8')
+
+    def dumps_compact(msg):
+        return json.dumps(msg, separators=(',', ':')).encode('utf-8')
+
+try:
+    import msgspec
+except ImportError:  # msgspec é opcional: pip install msgspec
+    msgspec = None
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson é opcional: pip install pysimdjson
+    simdjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson é opcional: pip install ijson
+    ijson = None
+
+try:
+    import uvloop
+    run = uvloop.run
+except ImportError:  # uvloop é opcional: pip install uvloop
+    run = asyncio.run
 
 PORT = 7077
+BATCH = 32        # datagramas por syscall (mesmo limite do libuv)
+MAX_BATCH = 1024  # UIO_MAXIOV: o kernel corta vlen acima disso
+BUF_SIZE = 1500   # MTU Ethernet/Wi-Fi
+MAX_DATAGRAM = 65507  # maior payload UDP sobre IPv4
+RCVBUF = 8 * 1024 * 1024  # absorve rajadas no kernel em vez de descartar
+ARENAS = 8       # lotes em voo entre o recv e a thread de saída
+MSG_WAITFORONE = 0x10000
+SO_INCOMING_CPU = getattr(socket, 'SO_INCOMING_CPU', 49)  # valores do Linux
+SO_BUSY_POLL = getattr(socket, 'SO_BUSY_POLL', 46)
+BUSY_POLL_USEC = 50
+WSAEMSGSIZE = 10040  # Windows: datagrama maior que o buffer
+
+# Broadcast de descoberta dos nós (send_discovery_broadcast em crates/ios-ffi)
+KNOWN_SCHEMAS = (
+    ("cortex", "node_id", "type", "agents"),
+)
+
+
+def _encode_scalar(value):
+    if isinstance(value, (dict, list)):
+        raise TypeError("valor aninhado")
+    return json.dumps(value).encode('utf-8')
+
+
+def compile_formatter(keys):
+    """Gera via exec um formatador indent=2 para objetos planos com essas chaves."""
+    parts = []
+    for i, key in enumerate(keys):
+        prefix = ("{\n  " if i == 0 else ",\n  ") + json.dumps(key) + ": "
+        parts.append(f"{prefix.encode('utf-8')!r} + enc(msg[{key!r}])")
+    parts.append(repr(b"\n}"))
+    src = "def fmt(msg):\n    return " + " + ".join(parts) + "\n"
+    namespace = {"enc": _encode_scalar}
+    exec(compile(src, f"<formatter {keys}>", "exec"), namespace)
+    return namespace["fmt"]
+
+
+if orjson is None:
+    # Sem orjson, o json.dumps(indent=2) recursivo em Python domina o custo;
+    # os esquemas conhecidos usam formatadores gerados uma vez na carga.
+    _FORMATTERS = {keys: compile_formatter(keys) for keys in KNOWN_SCHEMAS}
+    _dumps_generic = dumps_pretty
+
+    def dumps_pretty(msg):
+        fmt = _FORMATTERS.get(tuple(msg)) if type(msg) is dict else None
+        if fmt is not None:
+            try:
+                return fmt(msg)
+            except TypeError:
+                pass
+        return _dumps_generic(msg)
+
+
+if msgspec is not None:
+    class CortexMsg(msgspec.Struct):
+        """Broadcast de descoberta (send_discovery_broadcast em crates/ios-ffi)."""
+        cortex: bool
+        node_id: str
+        type: str
+        agents: int
+
+
+def make_validator():
+    """Valida contra o esquema do broadcast de descoberta.
+
+    Com msgspec o JSON é decodificado direto no Struct, sem dict intermediário,
+    e tipos errados são rejeitados na mesma passada. Campos extras são ignorados.
+    """
+    if msgspec is not None:
+        return msgspec.json.Decoder(CortexMsg).decode
+
+    def validate(data):
+        msg = loads(data)
+        if not (
+            isinstance(msg, dict)
+            and type(msg.get("cortex")) is bool
+            and isinstance(msg.get("node_id"), str)
+            and isinstance(msg.get("type"), str)
+            and type(msg.get("agents")) is int
+        ):
+            raise ValueError("fora do esquema de descoberta")
+        return msg
+    return validate
+
+
+def checked(validate, render):
+    """Valida antes de formatar; o ValueError cai no ramo de dados brutos."""
+    def render_checked(data):
+        validate(data)
+        return render(data)
+    return render_checked
+
+
+def render_pretty(data):
+    """Reindenta o JSON recebido (--pretty)."""
+    return dumps_pretty(loads(data))
+
+
+def render_raw(data):
+    """Valida o JSON e devolve os bytes recebidos sem reserializar."""
+    loads(data)
+    return data
+
+
+def make_projector(fields):
+    """Extrai só os campos de topo pedidos, como `campo=valor`.
+
+    Com pysimdjson o documento é validado inteiro, mas só os campos lidos
+    viram objetos Python; objetos e listas aninhados saem já minificados.
+    """
+    keys = [(field, field.encode('utf-8') + b"=") for field in fields]
+
+    if simdjson is not None:
+        parser = simdjson.Parser()
+        Object = simdjson.Object
+        missing = object()
+
+        def project(data):
+            doc = parser.parse(data)
+            if not isinstance(doc, Object):
+                raise ValueError("esperado um objeto JSON")
+            out = []
+            for field, label in keys:
+                value = doc.get(field, missing)
+                if value is missing:
+                    continue
+                mini = getattr(value, 'mini', None)
+                out.append(label + (mini if mini is not None else dumps_compact(value)))
+            return b" ".join(out)
+        return project
+
+    def project(data):
+        msg = loads(data)
+        if not isinstance(msg, dict):
+            raise ValueError("esperado um objeto JSON")
+        return b" ".join(label + dumps_compact(msg[field]) for field, label in keys if field in msg)
+    return project
+
+
+def make_flattener():
+    """Imprime todos os campos de topo como `campo=valor` (--flat).
+
+    Com ijson o documento é lido em fluxo: os pares chave/valor saem direto
+    dos eventos do parser, sem montar o dict de topo.
+    """
+    if ijson is not None:
+        kvitems = ijson.kvitems
+        JSONError = ijson.JSONError
+
+        def flatten(data):
+            data = bytes(data)
+            if data.lstrip()[:1] != b"{":
+                raise ValueError("esperado um objeto JSON")
+            try:
+                return b" ".join(
+                    key.encode('utf-8') + b"=" + dumps_compact(value)
+                    for key, value in kvitems(data, '', use_float=True)
+                )
+            except JSONError as e:
+                raise ValueError(str(e)) from e
+        return flatten
+
+    def flatten(data):
+        msg = loads(data)
+        if not isinstance(msg, dict):
+            raise ValueError("esperado um objeto JSON")
+        return b" ".join(key.encode('utf-8') + b"=" + dumps_compact(value) for key, value in msg.items())
+    return flatten
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),
+        ("sin_addr", ctypes.c_ubyte * 4),
+        ("sin_zero", ctypes.c_ubyte * 8),
+    ]
+
+
+class BatchReceiver:
+    """Recebe até `count` datagramas por chamada usando recvmmsg(2) (só Linux).
+
+    O buffer é dividido em `arenas`: cada chamada escreve numa arena, e as
+    fatias devolvidas continuam válidas até aquela arena ser reutilizada.
+    """
+
+    def __init__(self, sock, count=BATCH, size=BUF_SIZE, arenas=1):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._recvmmsg = libc.recvmmsg  # AttributeError fora do Linux
+        self._recvmmsg.restype = ctypes.c_int
+        self._fd = sock.fileno()
+        self._count = count
+        self._size = size
+
+        # Buffers, endereços e headers alocados uma vez e reutilizados
+        self._buf = bytearray(size * count * arenas)
+        self._view = memoryview(self._buf)
+        base = ctypes.addressof(ctypes.c_char.from_buffer(self._buf))
+        self._addrs = (_SockAddrIn * count)()
+        self._iovs = (_IOVec * (count * arenas))()
+        self._msgs = []
+        for arena in range(arenas):
+            msgs = (_MMsgHdr * count)()
+            for i in range(count):
+                slot = arena * count + i
+                iov = self._iovs[slot]
+                iov.iov_base = base + slot * size
+                iov.iov_len = size
+                hdr = msgs[i].msg_hdr
+                hdr.msg_name = ctypes.addressof(self._addrs[i])
+                hdr.msg_iov = ctypes.pointer(iov)
+                hdr.msg_iovlen = 1
+            self._msgs.append(msgs)
+
+    def recv(self, arena=0):
+        msgs = self._msgs[arena]
+        for i in range(self._count):
+            msgs[i].msg_hdr.msg_namelen = ctypes.sizeof(_SockAddrIn)
+
+        n = self._recvmmsg(self._fd, msgs, self._count, MSG_WAITFORONE | socket.MSG_TRUNC, None)
+        if n < 0:
+            err = ctypes.get_errno()
+            if err in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+                return []
+            raise OSError(err, os.strerror(err))
+
+        packets = []
+        first = arena * self._count
+        for i in range(n):
+            sa = self._addrs[i]
+            length = msgs[i].msg_len  # com MSG_TRUNC, o tamanho original
+            if length > self._size:
+                data = None
+            else:
+                start = (first + i) * self._size
+                data = self._view[start:start + length]
+            addr = (socket.inet_ntoa(bytes(sa.sin_addr)), socket.ntohs(sa.sin_port))
+            packets.append((data, addr))
+        return packets
+
+
+def make_receiver(sock, arenas=1, batch=BATCH, size=BUF_SIZE):
+    """Devolve `recv(arena)`, que lê um lote de (dados, endereço).
+
+    Datagramas maiores que `size` chegam com dados None, em vez de truncados.
+    """
+    try:
+        return BatchReceiver(sock, count=batch, size=size, arenas=arenas).recv
+    except AttributeError:
+        pass
+
+    # macOS/BSD não tem recvmmsg: um datagrama por syscall, sem alocar
+    views = [memoryview(bytearray(size)) for _ in range(arenas)]
+
+    def recv(arena=0):
+        view = views[arena]
+        try:
+            nbytes, _, flags, addr = sock.recvmsg_into((view,))
+        except BlockingIOError:
+            return ()
+        if flags & socket.MSG_TRUNC:
+            return ((None, addr),)
+        return ((view[:nbytes], addr),)
+    return recv
+
+
+def make_formatter(render, sep, size):
+    """Devolve `format(packets)`, que monta a saída de um lote num só bytes."""
+    # Poucos remetentes: o prefixo de cada IP é montado e codificado uma vez só
+    @functools.lru_cache(maxsize=64)
+    def banner(ip):
+        return b"\n\xe2\x9c\xa8 RECEBIDO de " + ip.encode('ascii') + sep
+
+    def format_packets(packets):
+        out = []
+        append = out.append
+        for data, addr in packets:
+            if data is None:
+                # Truncado pelo kernel: o JSON estaria incompleto, nem tenta parsear
+                append(f"\n⚠️ Datagrama de {addr[0]} maior que {size} bytes; descartado (use --buf-size)\n".encode('utf-8'))
+                continue
+            try:
+                append(banner(addr[0]) + render(data) + b"\n")
+            except ValueError:
+                append(f"\n⚠️ Dados brutos de {addr[0]}: {bytes(data)}\n".encode('utf-8'))
+        return b"".join(out)
+    return format_packets
+
+
+def print_worker(pending, free, render, sep, size, on_exit):
+    """Thread de saída: formata e escreve os lotes, devolvendo as arenas.
+
+    Ao terminar, por qualquer motivo, chama `on_exit` para o event loop parar
+    junto em vez de ficar esperando arenas que nunca voltam.
+    """
+    write = sys.stdout.buffer.write
+    flush = sys.stdout.buffer.flush
+    format_packets = make_formatter(render, sep, size)
+
+    try:
+        while True:
+            item = pending.get()
+            if item is None:
+                return
+            arena, packets = item
+            out = format_packets(packets)
+            free.put(arena)
+            write(out)
+            flush()
+    except BrokenPipeError:
+        # Quem lia a saída fechou o pipe (ex.: | head): encerra em silêncio, e o
+        # stdout vai para /dev/null para o flush da saída do Python não falhar
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        on_exit()
+
+
+def irq_cpu(iface):
+    """CPU que mais atendeu as interrupções da interface, segundo /proc/interrupts."""
+    with open('/proc/interrupts') as f:
+        cpus = [int(name[3:]) for name in f.readline().split()]
+        best, best_count = None, -1
+        for line in f:
+            # Nome inteiro (ou fila, como eth1-TxRx-0): eth1 não pode casar com eth10
+            names = line.replace(',', ' ').split()[1 + len(cpus):]
+            if not any(name == iface or name.startswith(iface + '-') for name in names):
+                continue
+            counts = line.split()[1:1 + len(cpus)]
+            for cpu, count in zip(cpus, counts):
+                if count.isdigit() and int(count) > best_count:
+                    best, best_count = cpu, int(count)
+    return best
+
+
+def pin_to_cpu(sock, cpu):
+    """Fixa o processo na CPU da fila RX e pede ao kernel a mesma CPU no socket."""
+    # O socket primeiro: se algo falhar, o processo continua sem afinidade
+    sock.setsockopt(socket.SOL_SOCKET, SO_INCOMING_CPU, cpu)
+    os.sched_setaffinity(0, {cpu})
+    try:
+        # Busy polling no driver (NAPI); acima do sysctl exige CAP_NET_ADMIN
+        sock.setsockopt(socket.SOL_SOCKET, SO_BUSY_POLL, BUSY_POLL_USEC)
+    except OSError:
+        pass
+
+
+async def listen(sock, render, sep, batch=BATCH, size=BUF_SIZE):
+    """Drena o socket sempre que o event loop sinaliza que há dados.
+
+    O event loop só recebe; parse e stdout ficam numa thread separada, para
+    um terminal lento não segurar o recv e causar descarte no kernel.
+    """
+    loop = asyncio.get_running_loop()
+    receive = make_receiver(sock, ARENAS, batch, size)
+
+    pending = queue.SimpleQueue()
+    free = queue.SimpleQueue()
+    for arena in range(ARENAS):
+        free.put(arena)
+
+    sys.stdout.flush()
+    # Ctrl-C/SIGTERM só marcam a parada; nada de KeyboardInterrupt no meio do lote
+    stop = asyncio.Event()
+
+    def printer_exited():
+        loop.call_soon_threadsafe(stop.set)
+
+    printer = threading.Thread(
+        target=print_worker, args=(pending, free, render, sep, size, printer_exited), daemon=True
+    )
+    printer.start()
+
+    def on_readable():
+        # Drena tudo que já está pronto. Sem arena livre, espera pouco pela
+        # thread de saída e devolve o controle ao loop (que atende os sinais);
+        # o add_reader chama de novo enquanto houver dados no socket.
+        while True:
+            try:
+                arena = free.get(timeout=0.1)
+            except queue.Empty:
+                return
+            packets = receive(arena)
+            if not packets:
+                free.put(arena)
+                return
+            pending.put((arena, packets))
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    loop.add_reader(sock.fileno(), on_readable)
+    try:
+        await stop.wait()
+    finally:
+        loop.remove_reader(sock.fileno())
+        pending.put(None)
+        printer.join()
+
+
+def listen_blocking(sock, render, sep, size=BUF_SIZE):
+    """Windows: um recvfrom bloqueante por datagrama, como o listener original.
+
+    Lá não há recvmmsg nem recvmsg_into, e o event loop padrão (Proactor) não
+    tem add_reader. O timeout curto devolve o controle ao Python de tempos em
+    tempos, para o Ctrl-C virar KeyboardInterrupt.
+    """
+    write = sys.stdout.buffer.write
+    flush = sys.stdout.buffer.flush
+    format_packets = make_formatter(render, sep, size)
+    sock.settimeout(0.5)
+    while True:
+        try:
+            packet = sock.recvfrom(size)
+        except socket.timeout:
+            continue
+        except OSError as e:
+            if getattr(e, 'winerror', None) != WSAEMSGSIZE:
+                raise
+            # O Windows descarta o excedente sem dizer quem mandou
+            packet = (None, ('?', 0))
+        try:
+            write(format_packets((packet,)))
+            flush()
+        except BrokenPipeError:
+            return
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Escuta os broadcasts UDP do CortexOS.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--pretty",
+        action="store_true",
+        help="reformata o JSON com indentação (por padrão os bytes recebidos são impressos como estão)",
+    )
+    mode.add_argument(
+        "--flat",
+        action="store_true",
+        help="imprime todos os campos de topo como campo=valor, lendo o JSON em fluxo",
+    )
+    mode.add_argument(
+        "--fields",
+        help="imprime só estes campos de topo (separados por vírgula), sem montar o JSON inteiro",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="só aceita broadcasts de descoberta (cortex, node_id, type, agents); o resto sai como dados brutos",
+    )
+    parser.add_argument(
+        "--cpu",
+        help="só Linux: fixa o listener nesta CPU, ou na CPU que atende as IRQs da interface dada (ex.: wlan0)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=int,
+        default=BATCH,
+        help=f"datagramas por recvmmsg no Linux (padrão: {BATCH}, máximo: {MAX_BATCH})",
+    )
+    parser.add_argument(
+        "--buf-size",
+        type=int,
+        default=BUF_SIZE,
+        help=f"bytes por datagrama; maiores são descartados com aviso (padrão: {BUF_SIZE}, máximo: {MAX_DATAGRAM})",
+    )
+    args = parser.parse_args()
+    if not 1 <= args.batch <= MAX_BATCH:
+        parser.error(f"--batch deve estar entre 1 e {MAX_BATCH}")
+    if not 1 <= args.buf_size <= MAX_DATAGRAM:
+        parser.error(f"--buf-size deve estar entre 1 e {MAX_DATAGRAM}")
+    return args
+
 
 def main():
+    args = parse_args()
+    if args.fields:
+        render, sep = make_projector([f.strip() for f in args.fields.split(',') if f.strip()]), b": "
+    elif args.flat:
+        render, sep = make_flattener(), b": "
+    elif args.pretty:
+        render, sep = render_pretty, b":\n"
+    else:
+        render, sep = render_raw, b": "
+
+    if args.strict:
+        # O validador já cobre a checagem de JSON que o render_raw faria
+        render = checked(make_validator(), (lambda data: data) if render is render_raw else render)
+
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF)
+    if hasattr(socket, 'SO_REUSEPORT'):
+        # Permite vários listeners na mesma porta. Broadcast/multicast chega
+        # copiado a cada um: todos veem todos os pacotes, o trabalho se repete
+        # em vez de ser dividido
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+    if args.cpu is not None:
+        if not hasattr(os, 'sched_setaffinity'):
+            print("⚠️ --cpu só é suportado no Linux; ignorando")
+        else:
+            try:
+                cpu = int(args.cpu) if args.cpu.isdigit() else irq_cpu(args.cpu)
+                if cpu is None:
+                    print(f"⚠️ Nenhuma IRQ de {args.cpu} em /proc/interrupts; sem fixar CPU")
+                else:
+                    pin_to_cpu(sock, cpu)
+                    print(f"   Fixado na CPU {cpu}")
+            except OSError as e:
+                # CPU inexistente/fora do cpuset, ou kernel sem SO_INCOMING_CPU
+                print(f"⚠️ Não foi possível fixar na CPU ({e}); sem fixar CPU")
     
     # No Mac, para ouvir Broadcast, bind no 0.0.0.0 ou '' é suficiente
     try:
@@ -19,18 +596,23 @@ def main():
     print(f"📡 Escutando por Broadcasts do CortexOS na porta {PORT}...")
     print(f"   (Certifique-se que o iPhone e o Mac estão no MESMO Wi-Fi)")
 
-    while True:
-        try:
-            data, addr = sock.recvfrom(1024)
-            try:
-                msg = json.loads(data.decode('utf-8'))
-                print(f"\n✨ RECEBIDO de {addr[0]}:")
-                print(json.dumps(msg, indent=2))
-            except json.JSONDecodeError:
-                print(f"\n⚠️ Dados brutos de {addr[0]}: {data}")
-        except KeyboardInterrupt:
-            print("\nParando...")
-            break
+    rcvbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    if rcvbuf < RCVBUF:
+        # Linux limita pelo net.core.rmem_max (e reporta o dobro do valor)
+        print(f"   SO_RCVBUF limitado a {rcvbuf} bytes (veja net.core.rmem_max)")
+
+    try:
+        if sys.platform == 'win32':
+            listen_blocking(sock, render, sep, args.buf_size)
+        else:
+            # O event loop (epoll/kqueue, ou uvloop se instalado) avisa quando há dados
+            sock.setblocking(False)
+            run(listen(sock, render, sep, args.batch, args.buf_size))
+    except KeyboardInterrupt:
+        pass
+    print("\nParando...")
+
+    sock.close()
 
 if __name__ == '__main__':
     main()
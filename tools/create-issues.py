@@ -3,187 +3,128 @@
 Generate GitHub issues for all CortexOS PRs.
 
 This script creates GitHub issues for each planned PR using the GitHub API.
-It reads the PR definitions and creates properly formatted issues.
+It reads the PR definitions from prs.json and creates properly formatted issues, batching
+them into GraphQL mutations that are sent concurrently.
 
 Requirements:
-    pip install PyGithub
+    pip install aiohttp
 
 Usage:
-    export GITHUB_TOKEN=your_token_here
-    python3 create-issues.py
+    export GITHUB_TOKEN=your_token_here   # or token1,token2,... to rotate
+    python3 create-issues.py [--rate ISSUES_PER_MINUTE] [--workers N] [--batch-size N] [--dry-run] [--yes]
+
+Issues that were created (or found) are recorded in .create-issues.state.json
+in the current directory, so reruns skip them without touching the API.
+Repository metadata and issue listings are cached in
+~/.cache/cortexos-issues.json.
 """
 
+import argparse
+import functools
+import importlib.util
+import itertools
+import json
+import logging
 import os
+import re
 import sys
-from dataclasses import dataclass
-from typing import List, Optional
-
-try:
-    from github import Github
-except ImportError:
-    print("Error: PyGithub not installed.")
-    print("Install it with: pip install PyGithub")
-    sys.exit(1)
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
 
+if TYPE_CHECKING:
+    # aiohttp and asyncio are imported for real inside the functions that use
+    # them, so --help and --dry-run never load the network stack
+    import aiohttp
 
-@dataclass
-class PR:
+try:
+    import orjson
+
+    encode_json = orjson.dumps
+    decode_json = orjson.loads
+except ImportError:  # optional: pip install orjson
+    def encode_json(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    decode_json = json.loads
+
+log = logging.getLogger("create-issues")
+
+REPO = "therenansimoes/cortexOS"
+API_URL = "https://api.github.com"
+DEFAULT_WORKERS = 8
+KEEPALIVE_TIMEOUT = 15.0
+# Per-request limit; GitHub gives up on a GraphQL query after 10s server-side
+REQUEST_TIMEOUT = 15.0
+PER_PAGE = 100
+# Issue titles look like "PR #12: Title"; the number identifies the PR even if
+# the title has been edited since
+ISSUE_TITLE_RE = re.compile(r"PR #(\d+):")
+MAX_RETRIES = 5
+MAX_BACKOFF = 60.0
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+STATE_FILE = ".create-issues.state.json"
+# Repository metadata and issue listings, shared across checkouts
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "cortexos-issues.json")
+METADATA_TTL = 24 * 60 * 60
+# PR definitions live next to this script and are only parsed on real/dry runs
+PRS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prs.json")
+
+# Issue creation pacing: a burst of BURST, then DEFAULT_RATE per minute,
+# which stays well clear of GitHub's secondary (abuse) rate limits.
+BURST = 20
+DEFAULT_RATE = 20.0
+
+# Default issues per GraphQL mutation (--batch-size); must not exceed BURST or
+# a batch could never acquire enough tokens from its bucket.
+GRAPHQL_BATCH = 20
+
+# Color given to labels this script has to create (GitHub's default grey)
+LABEL_COLOR = "ededed"
+
+
+class PR(NamedTuple):
     number: int
+    phase: int
     title: str
     milestone: str
     priority: str
     size: str
     duration: str
     description: str
-    dependencies: List[int]
-    tasks: List[str]
-    labels: List[str]
-
-
-# Define all PRs
-PRS = [
-    # Phase 1: Foundation Stabilization
-    PR(
-        number=2,
-        title="Event System Enhancements",
-        milestone="0.1",
-        priority="High",
-        size="Small",
-        duration="1 week",
-        description="Enhance event system with production-ready features including validation, trace propagation, metrics, and improved error handling.",
-        dependencies=[],
-        tasks=[
-            "Add event validation and sanitization",
-            "Implement trace context propagation",
-            "Add metrics collection for event throughput",
-            "Improve error handling in event bus",
-            "Add benchmarks for event processing",
-        ],
-        labels=["enhancement", "milestone-0.1", "priority-high"],
-    ),
-    PR(
-        number=3,
-        title="Backpressure Policy Testing & Documentation",
-        milestone="0.1",
-        priority="High",
-        size="Small",
-        duration="1-2 weeks",
-        description="Comprehensive testing and documentation for all backpressure policies with performance benchmarks.",
-        dependencies=[],
-        tasks=[
-            "Add unit tests for each policy",
-            "Add integration tests for policy behavior under load",
-            "Document policy selection guidelines",
-            "Add examples for each policy type",
-            "Performance benchmarks",
-        ],
-        labels=["testing", "documentation", "milestone-0.1", "priority-high"],
-    ),
-    PR(
-        number=4,
-        title="WASI Build Optimization",
-        milestone="0.1",
-        priority="High",
-        size="Medium",
-        duration="2 weeks",
-        description="Ensure WASI target builds efficiently with optimized binary size, CI checks, and comprehensive documentation.",
-        dependencies=[],
-        tasks=[
-            "Fix any WASI compilation issues",
-            "Optimize binary size for WASM",
-            "Add CI check for WASI builds",
-            "Document WASI limitations",
-            "Create WASM example",
-        ],
-        labels=["portability", "wasm", "milestone-0.1", "priority-high"],
-    ),
-    PR(
-        number=5,
-        title="Runtime Improvements",
-        milestone="0.1",
-        priority="High",
-        size="Medium",
-        duration="1 week",
-        description="Production-ready runtime features including graceful shutdown, statistics, health checks, and configuration.",
-        dependencies=[2],
-        tasks=[
-            "Add graceful shutdown",
-            "Implement runtime statistics",
-            "Add agent registry with health checks",
-            "Improve task scheduling",
-            "Add runtime configuration",
-        ],
-        labels=["enhancement", "milestone-0.1", "priority-high"],
-    ),
-    PR(
-        number=6,
-        title="Grid Discovery Enhancements",
-        milestone="0.2",
-        priority="High",
-        size="Medium",
-        duration="1-2 weeks",
-        description="Improve peer discovery reliability with fallback mechanisms, caching, filtering, and IPv6 support.",
-        dependencies=[],
-        tasks=[
-            "Add fallback discovery mechanisms",
-            "Implement discovery caching",
-            "Add discovery filtering by capability",
-            "Improve IPv6 support",
-            "Add discovery metrics",
-        ],
-        labels=["enhancement", "milestone-0.2", "priority-high"],
-    ),
-    PR(
-        number=7,
-        title="Grid Handshake Security",
-        milestone="0.2",
-        priority="Critical",
-        size="Medium",
-        duration="1-2 weeks",
-        description="Harden handshake protocol with challenge-response authentication, key negotiation, replay prevention, and security audit.",
-        dependencies=[],
-        tasks=[
-            "Add challenge-response authentication",
-            "Implement session key negotiation",
-            "Add replay attack prevention",
-            "Implement peer verification",
-            "Security audit and tests",
-        ],
-        labels=["security", "milestone-0.2", "priority-critical"],
-    ),
-    # Add more PRs here... (continuing pattern for all 40)
-]
-
-
-def create_issue_body(pr: PR) -> str:
-    """Generate issue body from PR definition."""
-    deps_text = "None"
-    if pr.dependencies:
-        deps_text = "\n".join([f"- [ ] PR #{dep}" for dep in pr.dependencies])
+    dependencies: Tuple[int, ...]
+    tasks: Tuple[str, ...]
+    labels: Tuple[str, ...]
 
-    tasks_text = "\n".join([f"- [ ] {task}" for task in pr.tasks])
 
-    body = f"""## Overview
+# Canonical label tuples: PRs with the same labels share one tuple object
+_LABEL_SETS: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
 
-**Milestone**: {pr.milestone}
-**Priority**: {pr.priority}
-**Estimated Size**: {pr.size}
-**Estimated Duration**: {pr.duration}
 
-## Description
+def intern_pr(pr: PR) -> PR:
+    """Share one object per distinct label set and repeated metadata string."""
+    labels = tuple(sys.intern(label) for label in pr.labels)
+    return pr._replace(
+        milestone=sys.intern(pr.milestone),
+        priority=sys.intern(pr.priority),
+        size=sys.intern(pr.size),
+        duration=sys.intern(pr.duration),
+        labels=_LABEL_SETS.setdefault(labels, labels),
+    )
 
-{pr.description}
 
-## Dependencies
+def load_prs(path: str = PRS_FILE) -> Tuple[PR, ...]:
+    """Read the PR definitions from `path` (a JSON array, one object per PR)."""
+    with open(path, "rb") as f:
+        entries = decode_json(f.read())
+    return tuple(
+        intern_pr(PR(**{key: tuple(value) if isinstance(value, list) else value for key, value in entry.items()}))
+        for entry in entries
+    )
 
-**Blocked by**:
-{deps_text}
 
-## Tasks
-
-{tasks_text}
-
-## Acceptance Criteria
+# Static tail of every issue body, built once at import
+ISSUE_BODY_FOOTER = """## Acceptance Criteria
 
 - [ ] Implementation complete
 - [ ] Unit tests added and passing
@@ -200,53 +141,694 @@ def create_issue_body(pr: PR) -> str:
 - See [PR_BREAKDOWN.md](https://github.com/therenansimoes/cortexOS/blob/main/PR_BREAKDOWN.md) for complete details
 - See [WORK_PLAN.md](https://github.com/therenansimoes/cortexOS/blob/main/WORK_PLAN.md) for schedule
 """
-    return body
+
+
+@functools.lru_cache(maxsize=None)
+def create_issue_body(pr: PR) -> str:
+    """Generate issue body from PR definition (cached per PR)."""
+    deps_text = "\n".join(f"- [ ] PR #{dep}" for dep in pr.dependencies) or "None"
+    tasks_text = "\n".join(f"- [ ] {task}" for task in pr.tasks)
+    # A single join over literal pieces, with no per-call dict or format parsing
+    return "".join((
+        "## Overview\n\n**Milestone**: ", pr.milestone,
+        "\n**Priority**: ", pr.priority,
+        "\n**Estimated Size**: ", pr.size,
+        "\n**Estimated Duration**: ", pr.duration,
+        "\n\n## Description\n\n", pr.description,
+        "\n\n## Dependencies\n\n**Blocked by**:\n", deps_text,
+        "\n\n## Tasks\n\n", tasks_text,
+        "\n\n", ISSUE_BODY_FOOTER,
+    ))
+
+
+class AsyncTokenBucket:
+    """Token bucket shared by coroutines to pace outgoing requests."""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # tokens per second
+        import asyncio
+
+        self.tokens = capacity
+        self.last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: float = 1) -> None:
+        """Wait until `n` tokens are available and take them.
+
+        Raises ValueError if `n` exceeds the bucket's capacity, since it could
+        never hold that many tokens.
+        """
+        import asyncio
+
+        if n > self.capacity:
+            raise ValueError(f"cannot acquire {n} tokens from a bucket of {self.capacity}")
+        # The lock makes waiters queue up in order instead of all waking at once
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.refill_rate)
+                self.last = now
+                if self.tokens >= n:
+                    self.tokens -= n
+                    return
+                await asyncio.sleep((n - self.tokens) / self.refill_rate)
+
+
+class RateLimitQuota:
+    """One token's primary rate limit, as last reported by GitHub's headers.
+
+    Every response carries X-RateLimit-Remaining/-Reset, so the quota is
+    tracked without polling /rate_limit.
+    """
+
+    def __init__(self):
+        self.remaining: Optional[int] = None  # unknown until the first response
+        self.reset = 0.0
+
+    def update(self, headers) -> None:
+        if "X-RateLimit-Remaining" in headers and "X-RateLimit-Reset" in headers:
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+            self.reset = float(headers["X-RateLimit-Reset"])
+
+    async def wait(self, need: int) -> None:
+        """Sleep until the window resets if fewer than `need` requests remain."""
+        import asyncio
+
+        if self.remaining is None or need == 0:
+            return
+        if self.remaining < need:
+            delay = self.reset - time.time() + 1
+            if delay > 0:
+                log.warning("Rate limit nearly exhausted (%d left), waiting %.0fs for reset", self.remaining, delay)
+                await asyncio.sleep(delay)
+            self.remaining = None
+        else:
+            # Reserve the budget now so concurrent workers don't all spend it
+            self.remaining -= need
+
+
+class Credential(NamedTuple):
+    auth: str  # Authorization header value
+    bucket: AsyncTokenBucket
+    quota: RateLimitQuota
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Fail fast after repeated request failures instead of hammering GitHub.
+
+    After `threshold` consecutive failures the breaker opens and every call is
+    rejected for `cooldown` seconds. The first call after that is let through
+    as a probe (half-open): success closes the breaker, failure reopens it.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened = 0.0
+
+    def check(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now."""
+        if self.state == "closed":
+            return
+        if self.state == "open" and time.monotonic() - self.opened >= self.cooldown:
+            self.state = "half_open"  # this caller is the probe
+            return
+        raise CircuitOpenError("circuit breaker open after repeated failures")
+
+    def success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.threshold:
+            if self.state != "open":
+                log.warning("Circuit breaker open, failing fast for %.0fs", self.cooldown)
+            self.state = "open"
+            self.opened = time.monotonic()
+
+
+def load_json(path: str) -> dict:
+    """Read the JSON object stored at `path`, or an empty dict if there is none."""
+    try:
+        with open(path, "rb") as f:
+            return decode_json(f.read())
+    except FileNotFoundError:
+        return {}
+
+
+def save_json(obj: dict, path: str) -> None:
+    """Write `obj` to `path` atomically so an interrupted run never corrupts it."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode_json(obj))
+    os.replace(tmp, path)
+
+
+async def fetch_existing_issues(session: "aiohttp.ClientSession", cache: dict) -> Dict[int, str]:
+    """Map the PR number of every PR issue in the repository to its URL.
+
+    One paginated listing up front replaces a lookup per PR, so reruns can
+    skip issues that already exist. Pages are stored in `cache` with their
+    ETag and revalidated with If-None-Match; GitHub answers unchanged pages
+    with 304, which doesn't count against the rate limit. Failed pages are
+    retried like GraphQL requests (see `retry_delay`).
+    """
+    import aiohttp
+    import asyncio
+
+    existing = {}
+    page = 1
+    while True:
+        key = f"issues:{REPO}:{page}"
+        cached = cache.get(key)
+        params = {"state": "all", "per_page": PER_PAGE, "page": page}
+        headers = {"If-None-Match": cached["etag"]} if cached else None
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with session.get(f"/repos/{REPO}/issues", params=params, headers=headers) as resp:
+                    if resp.status == 304:
+                        issues = cached["issues"]
+                        break
+                    if resp.status == 200:
+                        issues = [(issue["title"], issue["html_url"]) for issue in await resp.json()]
+                        if "ETag" in resp.headers:
+                            cache[key] = {"etag": resp.headers["ETag"], "issues": issues}
+                        break
+                    delay = retry_delay(resp, attempt)
+                    if delay is None or attempt == MAX_RETRIES:
+                        raise RuntimeError(f"HTTP {resp.status}: {await error_message(resp)}")
+                    log.warning("HTTP %d listing issues, retrying in %.1fs", resp.status, delay)
+            except aiohttp.ClientConnectorError as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                delay = backoff(attempt)
+                log.warning("%s, retrying in %.1fs", e, delay)
+            await asyncio.sleep(delay)
+        for title, url in issues:
+            match = ISSUE_TITLE_RE.match(title)
+            if match:
+                existing[int(match.group(1))] = url
+        if len(issues) < PER_PAGE:
+            return existing
+        page += 1
+
+
+async def error_message(resp: "aiohttp.ClientResponse") -> str:
+    """GitHub's error message from a failed response, whatever its body is.
+
+    Proxies in front of the API answer some 5xx errors with HTML, so the body
+    is decoded regardless of its content type.
+    """
+    try:
+        return (await resp.json(content_type=None)).get("message", "unknown error")
+    except ValueError:
+        return resp.reason
+
+
+def retry_delay(resp: "aiohttp.ClientResponse", attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a failed request, or None if it is final.
+
+    Rate-limited responses (403/429) sleep exactly as long as GitHub asks via
+    `Retry-After` or until `X-RateLimit-Reset`; 5xx errors back off
+    exponentially with jitter.
+    """
+    headers = resp.headers
+    if resp.status in (403, 429):
+        if "Retry-After" in headers:
+            return float(headers["Retry-After"])
+        if headers.get("X-RateLimit-Remaining") == "0" and "X-RateLimit-Reset" in headers:
+            return max(0.0, int(headers["X-RateLimit-Reset"]) - time.time()) + 1
+        if resp.status == 403:
+            return None  # a real permission error, not a rate limit
+    elif resp.status < 500:
+        return None
+    return backoff(attempt)
+
+
+def backoff(attempt: int) -> float:
+    """Exponential backoff capped at MAX_BACKOFF, plus up to a second of jitter.
+
+    The jitter keeps concurrent workers that failed together from retrying in
+    lockstep.
+    """
+    import random  # only needed once a request has failed
+
+    return min(MAX_BACKOFF, 2 ** attempt) + random.random()
+
+
+REPOSITORY_QUERY = """
+query($owner: String!, $name: String!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    id
+    labels(first: 100, after: $after) {
+      nodes { id name }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+
+async def post_graphql(
+    session: "aiohttp.ClientSession",
+    credentials: Iterator[Credential],
+    query: str,
+    variables: dict,
+    cost: int = 1,
+    idempotent: bool = True,
+    breaker: Optional[CircuitBreaker] = None,
+) -> dict:
+    """POST one GraphQL request and return the decoded response document.
+
+    Every attempt takes the next token from `credentials`, waits for its rate
+    limit window if fewer than `cost` requests remain in it, and then takes
+    `cost` tokens from that token's bucket. Rate-limited responses and
+    connections that could not be established are retried up to MAX_RETRIES
+    times (see `retry_delay`). 5xx responses are only retried for `idempotent`
+    requests: a mutation may have been applied before the server failed, and
+    sending it again would create its issues twice. Other transport errors are
+    never retried for the same reason.
+
+    With a `breaker`, every attempt is checked against it and reported to it,
+    so it trips on failed attempts rather than on requests that ran out of
+    retries; any exception counts as a failure, but waiting out a rate limit
+    doesn't.
+    """
+    import aiohttp
+    import asyncio
+
+    # Pre-encoded bytes bypass aiohttp's stdlib json.dumps serializer
+    body = encode_json({"query": query, "variables": variables})
+    for attempt in range(MAX_RETRIES + 1):
+        if breaker is not None:
+            breaker.check()
+        credential = next(credentials)
+        await credential.quota.wait(cost)
+        await credential.bucket.acquire(cost)
+        try:
+            async with session.post(
+                "/graphql",
+                data=body,
+                headers={"Authorization": credential.auth, "Content-Type": "application/json"},
+            ) as resp:
+                credential.quota.update(resp.headers)
+                if resp.status == 200:
+                    doc = await resp.json()
+                    if breaker is not None:
+                        breaker.success()
+                    return doc
+                delay = retry_delay(resp, attempt)
+                if resp.status >= 500 and not idempotent:
+                    delay = None
+                if breaker is not None and (delay is None or resp.status not in (403, 429)):
+                    breaker.failure()
+                if delay is not None and attempt < MAX_RETRIES:
+                    log.warning("HTTP %d from GraphQL, retrying in %.1fs", resp.status, delay)
+                else:
+                    raise RuntimeError(f"HTTP {resp.status}: {await error_message(resp)}")
+        except aiohttp.ClientConnectorError as e:
+            if breaker is not None:
+                breaker.failure()
+            if attempt == MAX_RETRIES:
+                raise
+            delay = backoff(attempt)
+            log.warning("%s, retrying in %.1fs", e, delay)
+        except RuntimeError:
+            raise  # a final HTTP error, already reported to the breaker above
+        except Exception:
+            # Timeouts, dropped connections, truncated bodies: not retried, since
+            # the request may have been applied, but they still count, or a
+            # failed half-open probe would leave the breaker stuck half-open
+            if breaker is not None:
+                breaker.failure()
+            raise
+        await asyncio.sleep(delay)
+
+
+async def fetch_repository(
+    session: "aiohttp.ClientSession",
+    credentials: Iterator[Credential],
+    cache: dict,
+    needed: Set[str],
+) -> Tuple[str, Dict[str, str]]:
+    """Return the repository's node ID and a map of label name to label ID.
+
+    Both come from `cache` if they were fetched within METADATA_TTL and the
+    cached labels include all of `needed` (a label may have been created
+    since); otherwise they are queried and cached again.
+    """
+    key = f"repository:{REPO}"
+    cached = cache.get(key)
+    if cached and time.time() - cached["ts"] < METADATA_TTL and needed <= cached["labels"].keys():
+        return cached["id"], cached["labels"]
+
+    owner, name = REPO.split("/")
+    labels = {}
+    after = None
+    while True:
+        doc = await post_graphql(
+            session, credentials, REPOSITORY_QUERY, {"owner": owner, "name": name, "after": after}, cost=0
+        )
+        repo = (doc.get("data") or {}).get("repository")
+        if repo is None:
+            errors = doc.get("errors") or [{"message": "repository not found"}]
+            raise RuntimeError(errors[0]["message"])
+        for label in repo["labels"]["nodes"]:
+            labels[label["name"]] = label["id"]
+        page = repo["labels"]["pageInfo"]
+        if not page["hasNextPage"]:
+            cache[key] = {"ts": time.time(), "id": repo["id"], "labels": labels}
+            return repo["id"], labels
+        after = page["endCursor"]
+
+
+async def create_labels(
+    session: "aiohttp.ClientSession",
+    credentials: Iterator[Credential],
+    repo_id: str,
+    names: Set[str],
+) -> Dict[str, str]:
+    """Create the labels in `names`, up to BURST per aliased mutation.
+
+    Unlike the REST API, GraphQL's createIssue only accepts existing label
+    IDs, so labels the repository lacks are created once up front. Returns a
+    map of label name to ID for the labels that were created; failures are
+    logged.
+    """
+    names = sorted(names)
+    created = {}
+    # A mutation costs one token per label, and a bucket never holds more than BURST
+    for start in range(0, len(names), BURST):
+        inputs = {
+            f"l{i}": {"repositoryId": repo_id, "name": name, "color": LABEL_COLOR}
+            for i, name in enumerate(names[start:start + BURST])
+        }
+        params = ", ".join(f"${alias}: CreateLabelInput!" for alias in inputs)
+        fields = " ".join(f"{alias}: createLabel(input: ${alias}) {{ label {{ id name }} }}" for alias in inputs)
+        try:
+            doc = await post_graphql(
+                session, credentials, f"mutation({params}) {{ {fields} }}", inputs, cost=len(inputs), idempotent=False
+            )
+        except Exception as e:
+            log.error("Could not create labels %s: %s", ", ".join(i["name"] for i in inputs.values()), e)
+            continue
+
+        data = doc.get("data") or {}
+        for alias in inputs:
+            result = data.get(alias)
+            if result and result.get("label"):
+                created[result["label"]["name"]] = result["label"]["id"]
+        for error in doc.get("errors") or []:
+            log.error("Could not create label: %s", error["message"])
+    return created
+
+
+async def create_batch(
+    session: "aiohttp.ClientSession",
+    credentials: Iterator[Credential],
+    issues: List[dict],
+    breaker: Optional[CircuitBreaker] = None,
+) -> list:
+    """Create one issue per prebuilt `CreateIssueInput` with a single aliased mutation.
+
+    Returns one result per input: a dict with the new issue's `html_url`, or
+    the exception that prevented it from being created. `breaker` is passed on
+    to `post_graphql`.
+    """
+    results: list = [None] * len(issues)
+    inputs = {f"i{i}": issue for i, issue in enumerate(issues)}
+    params = ", ".join(f"${alias}: CreateIssueInput!" for alias in inputs)
+    fields = " ".join(f"{alias}: createIssue(input: ${alias}) {{ issue {{ number url }} }}" for alias in inputs)
+    doc = await post_graphql(
+        session, credentials, f"mutation({params}) {{ {fields} }}", inputs,
+        cost=len(inputs), idempotent=False, breaker=breaker,
+    )
+
+    data = doc.get("data") or {}
+    errors = doc.get("errors") or []
+    by_alias = {e["path"][0]: e["message"] for e in errors if e.get("path")}
+    fallback = errors[0]["message"] if errors else "no issue returned"
+    for alias in inputs:
+        i = int(alias[1:])
+        created = data.get(alias)
+        if created and created.get("issue"):
+            results[i] = {"html_url": created["issue"]["url"], "number": created["issue"]["number"]}
+        else:
+            results[i] = RuntimeError(by_alias.get(alias, fallback))
+    return results
+
+
+async def create_all(
+    tokens: List[str],
+    prs: Sequence[PR],
+    rate: float,
+    workers: int = DEFAULT_WORKERS,
+    batch_size: int = GRAPHQL_BATCH,
+) -> list:
+    """Create all issues concurrently; failures are returned as exceptions.
+
+    PRs recorded in the state file or whose issue already exists are skipped
+    and marked with `"existing": True`. The rest are created `batch_size` at
+    a time, one mutation per batch, by `workers` workers pulling from a
+    shared queue, so open sockets and in-flight coroutines stay bounded
+    however many PRs there are.
+
+    Requests rotate round-robin over `tokens`. GitHub's limits apply per token,
+    so each one gets its own bucket and quota, and an exhausted credential
+    doesn't stall the others.
+    """
+    import aiohttp
+    import asyncio
+
+    credentials = itertools.cycle([
+        Credential(f"Bearer {token}", AsyncTokenBucket(capacity=BURST, refill_rate=rate / 60), RateLimitQuota())
+        for token in tokens
+    ])
+    headers = {
+        "Authorization": f"Bearer {tokens[0]}",
+        "Accept": "application/vnd.github+json",
+    }
+    # One pool shared by every worker, with a connection per worker: more would
+    # sit idle, fewer would make workers queue for a socket. Once the burst is
+    # spent a batch of `batch_size` issues goes out every batch_size * 60 / rate
+    # seconds, so idle connections are kept a little longer than that gap and
+    # the next batch can reuse one instead of opening a new TLS connection
+    # (unless GitHub closed it first). api.github.com is resolved once per run.
+    connector = aiohttp.TCPConnector(
+        limit=workers,
+        keepalive_timeout=max(KEEPALIVE_TIMEOUT, batch_size * 60 / rate + 5),
+        ttl_dns_cache=300,
+    )
+    # Without an explicit timeout aiohttp allows 5 minutes, so one hung request
+    # would hold up its worker for that long
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(API_URL, headers=headers, connector=connector, timeout=timeout) as session:
+        state = load_json(STATE_FILE)
+        cache = load_json(CACHE_FILE)
+        # Only list the repository's issues if some PR isn't already recorded
+        if all(str(pr.number) in state for pr in prs):
+            existing = {}
+        else:
+            existing = await fetch_existing_issues(session, cache)
+            save_json(cache, CACHE_FILE)
+
+        results: list = [None] * len(prs)
+        pending = []
+        for i, pr in enumerate(prs):
+            key = str(pr.number)
+            if key not in state and pr.number in existing:
+                state[key] = existing[pr.number]
+            if key in state:
+                results[i] = {"html_url": state[key], "existing": True}
+            else:
+                pending.append(i)
+        save_json(state, STATE_FILE)
+        if not pending:
+            return results
+
+        needed = {name for i in pending for name in prs[i].labels}
+        repo_id, label_ids = await fetch_repository(session, credentials, cache, needed)
+        # Resolve label names against the map fetched once above; labels the
+        # repository lacks are created here, and any that still can't be are
+        # reported instead of failing their mutations server-side
+        missing = needed - label_ids.keys()
+        if missing:
+            log.info("Creating %d missing labels: %s", len(missing), ", ".join(sorted(missing)))
+            label_ids.update(await create_labels(session, credentials, repo_id, missing))
+            missing -= label_ids.keys()
+        save_json(cache, CACHE_FILE)
+        if missing:
+            log.error("Labels missing from %s: %s", REPO, ", ".join(sorted(missing)))
+        # Build every mutation input (including the rendered body) before any
+        # worker starts, so the concurrent section below is pure I/O
+        resolved = []
+        for i in pending:
+            pr = prs[i]
+            absent = [name for name in pr.labels if name in missing]
+            if absent:
+                results[i] = ValueError(f"missing labels: {', '.join(absent)}")
+                continue
+            resolved.append((i, {
+                "repositoryId": repo_id,
+                "title": f"PR #{pr.number}: {pr.title}",
+                "body": create_issue_body(pr),
+                "labelIds": [label_ids[name] for name in pr.labels],
+            }))
+
+        queue: "asyncio.Queue[List[Tuple[int, dict]]]" = asyncio.Queue()
+        for start in range(0, len(resolved), batch_size):
+            queue.put_nowait(resolved[start:start + batch_size])
+
+        breaker = CircuitBreaker()
+
+        async def worker() -> None:
+            while not queue.empty():
+                batch = queue.get_nowait()
+                try:
+                    created = await create_batch(session, credentials, [issue for _, issue in batch], breaker)
+                except Exception as e:  # including CircuitOpenError
+                    created = [e] * len(batch)
+                for (i, _), result in zip(batch, created):
+                    results[i] = result
+                    if isinstance(result, dict):
+                        state[str(prs[i].number)] = result["html_url"]
+                save_json(state, STATE_FILE)
+
+        await asyncio.gather(*(worker() for _ in range(min(workers, queue.qsize()))))
+        return results
+
+
+def dry_run_report(prs: Sequence[PR]) -> str:
+    """Render what would be created as a single string, one block per PR."""
+    out = [
+        f"\n📝 Would create: PR #{pr.number}: {pr.title}\n"
+        f"   Milestone: {pr.milestone}\n"
+        f"   Priority: {pr.priority}  Size: {pr.size}  Duration: {pr.duration}\n"
+        f"   Labels: {', '.join(pr.labels)}\n"
+        for pr in prs
+    ]
+    out.append(f"\nDry run: {len(prs)} issues would be created.\n")
+    return "".join(out)
 
 
 def main():
-    # Get GitHub token
-    token = os.environ.get("GITHUB_TOKEN")
-    if not token:
-        print("Error: GITHUB_TOKEN environment variable not set")
-        print("Set it with: export GITHUB_TOKEN=your_token_here")
+    parser = argparse.ArgumentParser(description="Create GitHub issues for all CortexOS PRs.")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=DEFAULT_RATE,
+        help=f"issues created per minute per token after an initial burst of {BURST} (default: {DEFAULT_RATE:g})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"number of concurrent request workers (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=GRAPHQL_BATCH,
+        help=f"issues per GraphQL mutation, at most {BURST} (default: {GRAPHQL_BATCH})",
+    )
+    parser.add_argument(
+        "-y",
+        "--yes",
+        action="store_true",
+        help="create the issues without asking for confirmation (for CI)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="show the issues that would be created without calling the API",
+    )
+    parser.add_argument(
+        "--phase",
+        type=int,
+        help="only create issues for PRs in this WORK_PLAN.md phase",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if not 1 <= args.batch_size <= BURST:
+        parser.error(f"--batch-size must be between 1 and {BURST}")
+
+    prs = load_prs()
+    if args.phase is not None:
+        prs = tuple(pr for pr in prs if pr.phase == args.phase)
+
+    if args.dry_run:
+        # One write for the whole report instead of a print() per line
+        sys.stdout.write(dry_run_report(prs))
+        return
+
+    # aiohttp itself is only imported once the issues are being created
+    if importlib.util.find_spec("aiohttp") is None:
+        log.error("aiohttp not installed.")
+        log.error("Install it with: pip install aiohttp")
         sys.exit(1)
 
-    # Initialize GitHub client
-    g = Github(token)
-    repo = g.get_repo("therenansimoes/cortexOS")
+    # Get GitHub token(s)
+    tokens = [t.strip() for t in os.environ.get("GITHUB_TOKEN", "").split(",") if t.strip()]
+    if not tokens:
+        log.error("GITHUB_TOKEN environment variable not set")
+        log.error("Set it with: export GITHUB_TOKEN=your_token_here")
+        sys.exit(1)
 
-    print("CortexOS Issue Creator")
-    print("=" * 50)
-    print(f"Repository: {repo.full_name}")
-    print(f"Total PRs to create: {len(PRS)}")
-    print()
+    log.info("CortexOS Issue Creator")
+    log.info("Repository: %s", REPO)
+    log.info("Tokens: %d", len(tokens))
+    log.info("Total PRs to create: %d", len(prs))
 
-    # Ask for confirmation
-    response = input(f"Create {len(PRS)} issues? (y/N): ")
-    if response.lower() != "y":
-        print("Cancelled.")
-        sys.exit(0)
+    # Ask for confirmation unless --yes; no terminal to answer counts as "no"
+    if not args.yes:
+        try:
+            response = input(f"Create {len(prs)} issues? (y/N): ")
+        except EOFError:
+            response = ""
+        if response.lower() != "y":
+            log.info("Cancelled.")
+            sys.exit(0)
 
     # Create issues
-    created = 0
-    for pr in PRS:
-        title = f"PR #{pr.number}: {pr.title}"
-        body = create_issue_body(pr)
+    import asyncio
 
-        try:
-            issue = repo.create_issue(
-                title=title,
-                body=body,
-                labels=pr.labels,
-            )
-            print(f"✓ Created: {title} ({issue.html_url})")
-            created += 1
-        except Exception as e:
-            print(f"✗ Failed: {title}")
-            print(f"  Error: {e}")
+    results = asyncio.run(create_all(tokens, prs, args.rate, args.workers, args.batch_size))
 
-    print()
-    print(f"Created {created}/{len(PRS)} issues successfully!")
+    # Collect the per-issue lines and emit them as one record per level, so the
+    # report is a single write instead of one flush per issue
+    done, failed = [], []
+    created = skipped = 0
+    for pr, result in zip(prs, results):
+        title = f"PR #{pr.number}: {pr.title}"
+        if isinstance(result, Exception):
+            failed.append(f"✗ Failed: {title}: {result}")
+        elif result.get("existing"):
+            done.append(f"↷ Exists: {title} ({result['html_url']})")
+            skipped += 1
+        else:
+            done.append(f"✓ Created: {title} ({result['html_url']})")
+            created += 1
+    if done:
+        log.info("Results:\n%s", "\n".join(done))
+    if failed:
+        log.error("Failures:\n%s", "\n".join(failed))
+
+    log.info("Created %d/%d issues successfully!", created, len(prs))
+    if skipped:
+        log.info("Skipped %d issues that already exist.", skipped)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,37 @@
 import socket
 import struct
 import json
+import selectors
+import signal
+
+try:
+    import orjson
+
+    loads = orjson.loads
+
+    def dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:  # orjson is optional: pip install orjson
+    loads = json.loads  # also takes bytes, no separate decode step
+
+    def dumps_pretty(obj):
+        return json.dumps(obj, indent=2)
 
 MCAST_GRP = '239.255.70.77'
 MCAST_PORT = 7077
+RCVBUF = 4 * 1024 * 1024  # absorbs bursts of many nodes announcing at once
+MAX_DATAGRAM = 65535  # any legal UDP payload fits
 
 def main():
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    # Lets several listener processes bind the port at once. Multicast and
+    # broadcast datagrams are copied to every one of them, so each sees every
+    # packet: the work is duplicated, not balanced
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    # The kernel silently caps this at net.core.rmem_max
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RCVBUF)
     
     # Bind to all interfaces on port 7077
     sock.bind(('', MCAST_PORT))
@@ -18,17 +42,36 @@ def main():
 
     print(f"🎧 Listening for CortexOS discovery on {MCAST_GRP}:{MCAST_PORT}...")
 
-    while True:
-        try:
-            data, addr = sock.recvfrom(1024)
+    # Wake up at least once a second so Ctrl-C/SIGTERM stop the loop even
+    # when no packets are arriving
+    stop = False
+
+    def request_stop(signum, frame):
+        nonlocal stop
+        stop = True
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    sock.setblocking(False)
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+
+    while not stop:
+        for key, _ in sel.select(timeout=1.0):
             try:
-                msg = json.loads(data.decode('utf-8'))
+                data, addr = key.fileobj.recvfrom(MAX_DATAGRAM)
+            except BlockingIOError:
+                continue
+            try:
+                msg = loads(data)
                 print(f"✨ Discovered Node from {addr}:")
-                print(json.dumps(msg, indent=2))
-            except json.JSONDecodeError:
+                print(dumps_pretty(msg))
+            except ValueError:  # invalid JSON or UTF-8, from either parser
                 print(f"Received raw data from {addr}: {data}")
-        except KeyboardInterrupt:
-            break
+
+    sel.close()
+    sock.close()
 
 if __name__ == '__main__':
     main()
@@ -1,19 +1,123 @@
-import socket
+import argparse
+import ctypes
+import errno
 import json
+import os
+import socket
+import time
 
 MCAST_GRP = '239.255.70.77'
 MCAST_PORT = 7077
+BATCH = 64  # datagrams per sendmmsg(2) call
+SNDBUF = 4 * 1024 * 1024
 
-sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 2)
-
-msg = json.dumps({
+# Encoded once; every datagram sent reuses these bytes
+PAYLOAD = json.dumps({
     "cortex": True,
     "node_id": "TEST_SENDER",
     "type": "discovery",
     "agents": 1
-})
+}).encode('utf-8')
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class _SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort),
+        ("sin_port", ctypes.c_uint16),
+        ("sin_addr", ctypes.c_ubyte * 4),
+        ("sin_zero", ctypes.c_ubyte * 8),
+    ]
+
+
+class BatchSender:
+    """Sends one payload up to `batch` times per sendmmsg(2) call (Linux only)."""
+
+    def __init__(self, sock, payload, dest, batch=BATCH):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._sendmmsg = libc.sendmmsg  # AttributeError off Linux
+        self._sendmmsg.restype = ctypes.c_int
+        self._fd = sock.fileno()
+
+        # Every header points at the same payload and destination
+        host, port = dest
+        self._buf = ctypes.create_string_buffer(payload, len(payload))
+        self._iov = _IOVec(ctypes.addressof(self._buf), len(payload))
+        self._addr = _SockAddrIn(
+            socket.AF_INET,
+            socket.htons(port),
+            (ctypes.c_ubyte * 4)(*socket.inet_aton(host)),
+        )
+        self._hdrs = (_MMsgHdr * batch)()
+        for hdr in self._hdrs:
+            hdr.msg_hdr.msg_name = ctypes.addressof(self._addr)
+            hdr.msg_hdr.msg_namelen = ctypes.sizeof(self._addr)
+            hdr.msg_hdr.msg_iov = ctypes.pointer(self._iov)
+            hdr.msg_hdr.msg_iovlen = 1
+
+    def send(self, count):
+        sent = 0
+        while sent < count:
+            n = self._sendmmsg(self._fd, self._hdrs, min(count - sent, len(self._hdrs)), 0)
+            if n < 0:
+                err = ctypes.get_errno()
+                if err == errno.EINTR:
+                    continue
+                raise OSError(err, os.strerror(err))
+            sent += n
+        return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send CortexOS discovery test packets.")
+    parser.add_argument("-n", "--count", type=int, default=1,
+                        help="number of packets to send (default: 1)")
+    args = parser.parse_args()
+    if args.count < 1:
+        parser.error("--count must be at least 1")
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+    sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 2)
+    dest = (MCAST_GRP, MCAST_PORT)
+
+    print(f"Sending to {MCAST_GRP}:{MCAST_PORT}...")
+    if args.count == 1:
+        sock.sendto(PAYLOAD, dest)
+        print("Sent!")
+        return
+
+    # Stress mode: a large send buffer plus one syscall per BATCH packets
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SNDBUF)
+    start = time.perf_counter()
+    try:
+        sent = BatchSender(sock, PAYLOAD, dest).send(args.count)
+    except AttributeError:  # no sendmmsg: one sendto per packet
+        for _ in range(args.count):
+            sock.sendto(PAYLOAD, dest)
+        sent = args.count
+    # A fast run can finish within the clock's resolution
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Sent {sent} packets in {elapsed:.3f}s ({sent / elapsed:.0f} pps)")
+
 
-print(f"Sending to {MCAST_GRP}:{MCAST_PORT}...")
-sock.sendto(msg.encode('utf-8'), (MCAST_GRP, MCAST_PORT))
-print("Sent!")
+if __name__ == '__main__':
+    main()